@@ -130,20 +130,22 @@ def reset_id_sequence(db_path, table_name):
     conn.close()
 
 if __name__ == "__main__":
+    from ba_config import get_path
+
     # Argumentparser einrichten
     parser = argparse.ArgumentParser(description="Verwalte Liganden in der Datenbank.")
     parser.add_argument(
         "--db_path",
-        default="c:/Users/Florian V/Documents/Komplexe/DB/Ligant.db",  # Standardpfad zur SQLite-Datenbank
-        help="Pfad zur SQLite-Datenbank. Standard: c:/Users/Florian V/Documents/Komplexe/DB/Ligant.db"
+        default=get_path("ligand_db"),  # Standardpfad zur SQLite-Datenbank (BA_LIGAND_DB bzw. Konfiguration)
+        help="Pfad zur SQLite-Datenbank. Standard: BA_LIGAND_DB bzw. Konfiguration"
     )
     parser.add_argument("--list_molecules", action="store_true", help="Listet alle Moleküle in der Datenbank auf.")
     parser.add_argument("--list_atoms", type=int, help="Listet die Atome eines Moleküls mit der angegebenen ID auf.")
     parser.add_argument("--save_xyz", type=int, help="Speichert ein Molekül mit der angegebenen ID als XYZ-Datei.")
     parser.add_argument(
         "--output_dir",
-        default="c:/Users/Florian V/Documents/Komplexe/DB/Lig_Neu",
-        help="Verzeichnis für die Ausgabe der XYZ-Datei. Standard: c:/Users/Florian V/Documents/Komplexe/DB/Lig_Neu"
+        default=get_path("output_dir"),
+        help="Verzeichnis für die Ausgabe der XYZ-Datei. Standard: BA_OUTPUT_DIR bzw. Konfiguration"
     )
     parser.add_argument("--delete_ligand", type=int, help="Löscht einen Liganden mit der angegebenen ID aus der Datenbank.")
 
@@ -3,6 +3,8 @@ import numpy as np
 from itertools import permutations
 import os
 
+import metalle_db
+
 def fetch_all_ligands(db_path):
     """
     Ruft alle Liganden aus der Datenbank ab.
@@ -42,6 +44,35 @@ def fetch_atoms_for_ligand(db_path, molecule_name):
     conn.close()
     return atoms
 
+def select_central_atom_geometry(central_atom, oxidation=None, metal_db_path=None, koordinationszahl=6, geometrie="Oktaedrisch"):
+    """
+    Wählt Koordinationszahl und Geometrie für das Zentralatom aus der Metall-Datenbank.
+    Gesucht wird standardmäßig eine oktaedrische Umgebung (Koordinationszahl 6), bei Angabe der
+    Oxidationsstufe über den Index auf (oxidation, koordinationszahl, geometrie).
+    Wirft ValueError, wenn das Metall unbekannt ist oder keine passende Umgebung eingetragen ist.
+    """
+    if oxidation is not None:
+        for row in metalle_db.get_by_umgebung(oxidation, koordinationszahl, geometrie, metal_db_path):
+            if row["name"] == central_atom:
+                return row["koordinationszahl"], row["geometrie"]
+
+    # Kein Treffer: über den Namen herausfinden, woran es liegt
+    entries = metalle_db.get_by_name(central_atom, metal_db_path)
+    if not entries:
+        raise ValueError(f"'{central_atom}' ist nicht in der Metall-Datenbank eingetragen.")
+
+    if oxidation is not None:
+        entries = [row for row in entries if row["oxidation"] == oxidation]
+        if not entries:
+            raise ValueError(f"Für '{central_atom}' ist keine Oxidationsstufe {oxidation} eingetragen.")
+    else:
+        for row in entries:
+            if row["koordinationszahl"] == koordinationszahl and row["geometrie"] == geometrie:
+                return row["koordinationszahl"], row["geometrie"]
+
+    environments = ", ".join(f"KZ {row['koordinationszahl']} {row['geometrie']}" for row in entries)
+    raise ValueError(f"Für '{central_atom}' ist keine Umgebung KZ {koordinationszahl} {geometrie} eingetragen ({environments}).")
+
 def rotation_matrix_from_vectors(v1, v2):
     """
     Berechnet die Rotationsmatrix, die den Vektor v1 auf den Vektor v2 abbildet.
@@ -250,8 +281,10 @@ def save_all_octahedral_arrangements(db_path, central_atom, ligands, output_dir)
         print(f"Anordnung {i} wurde in '{output_file}' gespeichert.")
 
 if __name__ == "__main__":
+    from ba_config import get_path
+
     # Pfad zur Datenbank
-    db_path = "c:/Users/Florian V/Documents/Komplexe/DB/Ligant.db"
+    db_path = get_path("ligand_db")
 
     # Liste aller Liganden aus der Datenbank abrufen
     all_ligands = fetch_all_ligands(db_path)
@@ -275,8 +308,16 @@ if __name__ == "__main__":
     # Zentralatom
     central_atom = input("Gib das Zentralatom ein (z. B. Fe): ").strip()
 
+    # Oxidationsstufe (optional, leer lassen für beliebige Oxidationsstufe)
+    oxidation = input("Gib die Oxidationsstufe des Zentralatoms ein (z. B. 2, leer = beliebig): ").strip()
+    oxidation = int(oxidation) if oxidation else None
+
+    # Koordinationsumgebung des Zentralatoms prüfen (ValueError, wenn keine oktaedrische Umgebung eingetragen ist)
+    koordinationszahl, geometrie = select_central_atom_geometry(central_atom, oxidation, get_path("metal_db"))
+    print(f"Koordinationszahl {koordinationszahl}, Geometrie: {geometrie}")
+
     # Verzeichnis für die Ausgabe
-    output_dir = "c:/Users/Florian V/Documents/Komplexe/DB/Arrangements"
+    output_dir = get_path("arrangements_dir")
 
     # Generiere und speichere alle möglichen Anordnungen
-    save_all_octahedral_arrangements(db_path, central_atom, selected_names, output_dir)
\ No newline at end of file
+    save_all_octahedral_arrangements(db_path, central_atom, selected_names, output_dir)
\ No newline at end of file
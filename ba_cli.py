@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import shlex
+import sqlite3
+import sys
+
+from ba_config import get_path
+
+# Schwere Module (NumPy über xyz_norm und OCKombi) werden erst im jeweiligen Unterbefehl importiert.
+
+# Fehler, die als "Fehler: ..." gemeldet werden statt mit Traceback
+ERRORS = (ValueError, FileNotFoundError, sqlite3.Error)
+
+def cmd_ingest(args):
+    import xyz_norm
+
+    input_file_path = os.path.join(args.input_dir or get_path("input_dir"), args.input_file)
+    if not os.path.exists(input_file_path):
+        raise FileNotFoundError(f"Die Eingabedatei '{input_file_path}' wurde nicht gefunden.")
+
+    atoms = xyz_norm.load_xyz(input_file_path)
+    transformed_atoms = xyz_norm.align_ligand(atoms, args.central_atom_index)
+    xyz_norm.save_to_database(args.db_path, args.molecule_name, transformed_atoms)
+
+def cmd_renormalize(args):
+    import xyz_norm
+
+    xyz_norm.renormalize_database(args.db_path)
+
+def cmd_list(args):
+    import List
+
+    if args.atoms is not None:
+        List.list_atoms(args.db_path, args.atoms)
+    else:
+        List.list_molecules(args.db_path)
+
+def cmd_export(args):
+    import List
+
+    List.save_ligand_to_xyz(args.db_path, args.molecule_id, args.output_dir or get_path("output_dir"))
+
+def cmd_delete(args):
+    import List
+
+    List.delete_ligand(args.db_path, args.molecule_id)
+
+def cmd_enumerate(args):
+    import OCKombi
+    import metalle_db
+
+    all_ligands = OCKombi.fetch_all_ligands(args.db_path)
+    for name in args.ligands:
+        if name not in all_ligands:
+            raise ValueError(f"Ligand '{name}' wurde nicht in der Datenbank gefunden.")
+
+    if args.skip_metal_check:
+        print("Hinweis: Die Koordinationsumgebung des Zentralatoms wird nicht geprüft.")
+    else:
+        # Bricht mit ValueError ab, wenn keine oktaedrische Umgebung eingetragen ist
+        metalle_db.refresh_cache(args.metal_db)
+        koordinationszahl, geometrie = OCKombi.select_central_atom_geometry(
+            args.central_atom, args.oxidation, args.metal_db)
+        print(f"Koordinationszahl {koordinationszahl}, Geometrie: {geometrie}")
+
+    OCKombi.save_all_octahedral_arrangements(
+        args.db_path, args.central_atom, args.ligands, args.output_dir or get_path("arrangements_dir"))
+
+def cmd_metals(args):
+    import metalle_db
+
+    metalle_db.refresh_cache(args.metal_db)
+    if args.name is not None:
+        rows = metalle_db.get_by_name(args.name, args.metal_db)
+    elif args.ordnungszahl is not None:
+        rows = metalle_db.get_by_ordnungszahl(args.ordnungszahl, args.metal_db)
+    elif args.umgebung is not None:
+        oxidation, koordinationszahl, geometrie = args.umgebung
+        rows = metalle_db.get_by_umgebung(oxidation, koordinationszahl, geometrie, args.metal_db)
+    else:
+        rows = metalle_db.fetch_data(args.metal_db)
+
+    for row in rows:
+        print(tuple(row))
+
+def split_line(line):
+    # Wie shlex.split, aber ohne Backslash als Escape-Zeichen, damit Windows-Pfade (C:\Lig\a.xyz)
+    # erhalten bleiben; Leerzeichen in Pfaden werden mit "..." oder '...' geschützt.
+    lexer = shlex.shlex(line, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    lexer.escape = ""
+    return list(lexer)
+
+def cmd_batch(args):
+    # Befehle zeilenweise von stdin lesen; Start von Interpreter und Modulen fällt nur einmal an
+    parser = build_parser()
+    # --db_path/--metal_db des Batch-Aufrufs gelten für alle Zeilen, sofern eine Zeile sie nicht selbst setzt
+    parser.set_defaults(db_path=args.db_path, metal_db=args.metal_db)
+    interactive = sys.stdin.isatty()
+    failures = 0
+
+    while True:
+        if interactive:
+            try:
+                line = input("ba> ")
+            except EOFError:
+                break
+        else:
+            line = sys.stdin.readline()
+            if not line:
+                break
+
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line in ("exit", "quit"):
+            break
+
+        try:
+            argv = split_line(line)
+            if not any(argv):
+                continue
+            if argv[0] in ("batch", "repl"):
+                raise ValueError("Der Batch-Modus kann nicht verschachtelt werden.")
+            run(parser, argv)
+        except SystemExit as exc:
+            # argparse beendet bei Fehlern oder --help den Prozess; im Batch-Modus weitermachen
+            if exc.code:
+                failures += 1
+        except Exception as exc:
+            failures += 1
+            print(f"Fehler: {exc}", file=sys.stderr)
+
+    return 1 if failures else 0
+
+class UmgebungAction(argparse.Action):
+    # Oxidationsstufe und Koordinationszahl von --umgebung als Ganzzahlen einlesen
+    def __call__(self, parser, namespace, values, option_string=None):
+        oxidation, koordinationszahl, geometrie = values
+        try:
+            values = (int(oxidation), int(koordinationszahl), geometrie)
+        except ValueError:
+            raise argparse.ArgumentError(self, "Oxidationsstufe und Koordinationszahl müssen Ganzzahlen sein.")
+        setattr(namespace, self.dest, values)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ba", description="Verwalte Liganden, Metalle und oktaedrische Komplexe.")
+    parser.add_argument("--db_path", default=None, help="Pfad zur Liganden-Datenbank (Standard: BA_LIGAND_DB bzw. Konfiguration).")
+    parser.add_argument("--metal_db", default=None, help="Pfad zur Metall-Datenbank (Standard: BA_METAL_DB bzw. Konfiguration).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest = subparsers.add_parser("ingest", help="Liest eine XYZ-Datei ein, richtet den Liganden aus und speichert ihn.")
+    ingest.add_argument("input_file", help="Name der XYZ-Datei im Eingabeverzeichnis.")
+    ingest.add_argument("molecule_name", help="Name des Moleküls in der Datenbank.")
+    ingest.add_argument("central_atom_index", type=int, help="Index des zentralen Atoms (0-basiert, nach Entfernen von Cu).")
+    ingest.add_argument("--input_dir", default=None, help="Eingabeverzeichnis (Standard: BA_INPUT_DIR bzw. Konfiguration).")
+    ingest.set_defaults(func=cmd_ingest)
+
+    renormalize = subparsers.add_parser("renormalize", help="Richtet alle gespeicherten Moleküle neu aus.")
+    renormalize.set_defaults(func=cmd_renormalize)
+
+    list_parser = subparsers.add_parser("list", help="Listet die Moleküle oder die Atome eines Moleküls auf.")
+    list_parser.add_argument("--atoms", type=int, metavar="ID", help="Listet die Atome des Moleküls mit dieser ID auf.")
+    list_parser.set_defaults(func=cmd_list)
+
+    export = subparsers.add_parser("export", help="Speichert ein Molekül als XYZ-Datei.")
+    export.add_argument("molecule_id", type=int, help="ID des Moleküls.")
+    export.add_argument("--output_dir", default=None, help="Ausgabeverzeichnis (Standard: BA_OUTPUT_DIR bzw. Konfiguration).")
+    export.set_defaults(func=cmd_export)
+
+    delete = subparsers.add_parser("delete", help="Löscht einen Liganden aus der Datenbank.")
+    delete.add_argument("molecule_id", type=int, help="ID des Liganden.")
+    delete.set_defaults(func=cmd_delete)
+
+    enumerate_parser = subparsers.add_parser("enumerate", help="Erzeugt alle oktaedrischen Anordnungen von 6 Liganden.")
+    enumerate_parser.add_argument("central_atom", help="Zentralatom, z. B. Fe.")
+    enumerate_parser.add_argument("ligands", nargs=6, metavar="LIGAND", help="Namen der 6 Liganden.")
+    enumerate_parser.add_argument("--oxidation", type=int, default=None, help="Oxidationsstufe des Zentralatoms.")
+    enumerate_parser.add_argument("--skip_metal_check", action="store_true",
+                                  help="Zentralatom nicht gegen die Metall-Datenbank prüfen.")
+    enumerate_parser.add_argument("--output_dir", default=None, help="Ausgabeverzeichnis (Standard: BA_ARRANGEMENTS_DIR bzw. Konfiguration).")
+    enumerate_parser.set_defaults(func=cmd_enumerate)
+
+    metals = subparsers.add_parser("metals", help="Fragt die Metall-Datenbank ab.")
+    query = metals.add_mutually_exclusive_group()
+    query.add_argument("--name", help="Einträge zu diesem Metallnamen.")
+    query.add_argument("--ordnungszahl", type=int, help="Einträge zu dieser Ordnungszahl.")
+    query.add_argument("--umgebung", nargs=3, metavar=("OXIDATION", "KZ", "GEOMETRIE"), action=UmgebungAction,
+                       help="Einträge mit Oxidationsstufe, Koordinationszahl und Geometrie.")
+    metals.set_defaults(func=cmd_metals)
+
+    batch = subparsers.add_parser("batch", aliases=["repl"], help="Liest Befehle zeilenweise von stdin.")
+    batch.set_defaults(func=cmd_batch)
+
+    return parser
+
+def run(parser, argv):
+    args = parser.parse_args(argv)
+    args.db_path = args.db_path or get_path("ligand_db")
+    args.metal_db = args.metal_db or get_path("metal_db")
+    return args.func(args)
+
+def main(argv=None):
+    try:
+        return run(build_parser(), argv) or 0
+    except ERRORS as exc:
+        print(f"Fehler: {exc}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
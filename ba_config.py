@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import configparser
+import os
+
+# Standardwerte, falls weder Umgebungsvariable noch Konfigurationsdatei einen Pfad vorgeben
+DEFAULTS = {
+    "ligand_db": "Ligant.db",
+    "metal_db": "metalle.db",
+    "input_dir": "Lig_Alt",
+    "output_dir": "Lig_Neu",
+    "arrangements_dir": "Arrangements",
+}
+
+# Umgebungsvariable je Schlüssel, z. B. BA_LIGAND_DB
+ENV_PREFIX = "BA_"
+
+# Konfigurationsdatei (Abschnitt [paths]); Pfad über BA_CONFIG änderbar
+CONFIG_FILES = [
+    os.path.join(os.path.expanduser("~"), ".config", "ba.ini"),
+    "ba.ini",
+]
+
+_config = None
+
+def load_config():
+    """
+    Liest die Konfigurationsdateien einmalig ein.
+    """
+    global _config
+    if _config is None:
+        _config = configparser.ConfigParser()
+        files = [os.environ["BA_CONFIG"]] if "BA_CONFIG" in os.environ else CONFIG_FILES
+        _config.read(files, encoding="utf-8")
+    return _config
+
+def get_path(key):
+    """
+    Gibt den Pfad für einen Schlüssel zurück.
+    Reihenfolge: Umgebungsvariable, Konfigurationsdatei, Standardwert.
+    """
+    if key not in DEFAULTS:
+        raise KeyError(f"Unbekannter Konfigurationsschlüssel '{key}'.")
+    env_value = os.environ.get(ENV_PREFIX + key.upper())
+    if env_value:
+        return env_value
+    return load_config().get("paths", key, fallback=DEFAULTS[key])
@@ -1,20 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import sqlite3
 import tkinter as tk
 from tkinter import messagebox
 
-# Funktion zum Hinzufügen von Metallen in die Datenbank
-def add_metal(name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie):
-    conn = sqlite3.connect("metalle.db")
-    cursor = conn.cursor()
-
-    # SQL-Befehl, um Daten in die Tabelle 'metalle' einzufügen
-    cursor.execute("INSERT INTO metalle (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie) VALUES (?, ?, ?, ?, ?, ?)", 
-                   (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie))
-
-    conn.commit()
-    conn.close()
+from metalle_db import add_metal
 
 # Funktion zum Überprüfen und Hinzufügen der Metall-Daten
 def submit():
@@ -1,59 +1,132 @@
 # -*- coding: utf-8 -*-
 import sqlite3  # Importiert SQLite für die Datenbank
+from functools import lru_cache
 
-# Verbindung zur Datenbank herstellen (wird erstellt, falls nicht vorhanden)
-conn = sqlite3.connect("metalle.db")
-cursor = conn.cursor()
-
-# Tabelle für Metalle erstellen, falls sie noch nicht existiert
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS metalle (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Automatische ID für jeden Eintrag
-    name TEXT NOT NULL,                     -- Name des Metalls (z. B. Kupfer)
-    ordnungszahl INTEGER NOT NULL,          -- Ordnungszahl (z. B. 29 für Kupfer)
-    d_elektronen INTEGER NOT NULL,          -- Anzahl der d-Elektronen
-    oxidation INTEGER NOT NULL,             -- Oxidationsstufe (z. B. +2)
-    koordinationszahl INTEGER NOT NULL,     -- Koordinationszahl (z. B. 4)
-    geometrie TEXT NOT NULL                 -- Geometrie (z. B. quadratisch-planar)
-)
-""")
-
-# Änderungen speichern und Verbindung schließen
-conn.commit()
-conn.close()
+from ba_config import get_path
+
+# Pfad zur Metall-Datenbank (wird erstellt, falls nicht vorhanden).
+# None: beim ersten Zugriff aus BA_METAL_DB bzw. der Konfiguration (ba_config) lesen.
+DB_PATH = None
+
+# Pfad für einen Aufruf bestimmen: Argument, DB_PATH oder Konfiguration
+def _resolve_path(db_path):
+    return db_path or DB_PATH or get_path("metal_db")
+
+# Datenbanken, deren Tabelle und Indizes in diesem Prozess bereits angelegt wurden
+_initialisiert = set()
+
+# Funktion zum Anlegen der Tabelle und der Indizes (erst beim ersten Zugriff)
+def init_db(db_path=None):
+    db_path = _resolve_path(db_path)
+    if db_path in _initialisiert:
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    # Tabelle für Metalle erstellen, falls sie noch nicht existiert
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS metalle (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Automatische ID für jeden Eintrag
+        name TEXT NOT NULL,                     -- Name des Metalls (z. B. Kupfer)
+        ordnungszahl INTEGER NOT NULL,          -- Ordnungszahl (z. B. 29 für Kupfer)
+        d_elektronen INTEGER NOT NULL,          -- Anzahl der d-Elektronen
+        oxidation INTEGER NOT NULL,             -- Oxidationsstufe (z. B. +2)
+        koordinationszahl INTEGER NOT NULL,     -- Koordinationszahl (z. B. 4)
+        geometrie TEXT NOT NULL                 -- Geometrie (z. B. quadratisch-planar)
+    )
+    """)
+
+    # Indizes für die Abfragen nach Name, Ordnungszahl und Koordinationsumgebung
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_metalle_name ON metalle (name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_metalle_ordnungszahl ON metalle (ordnungszahl)")
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_metalle_umgebung
+    ON metalle (oxidation, koordinationszahl, geometrie)
+    """)
+
+    # Änderungen speichern und Verbindung schließen
+    conn.commit()
+    conn.close()
+    _initialisiert.add(db_path)
+
+# Offene Verbindungen und zuletzt gesehene PRAGMA data_version je Datenbank
+_connections = {}
+_data_versions = {}
+
+# Eine Verbindung je Datenbank für die Abfragen offen halten
+def _connect(db_path):
+    conn = _connections.get(db_path)
+    if conn is None:
+        init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row  # Zugriff auf die Spalten über ihren Namen
+        _connections[db_path] = conn
+        _data_versions[db_path] = conn.execute("PRAGMA data_version").fetchone()[0]
+    return conn
+
+# Gecachte Abfrage; die Ergebnisse sind Tupel, damit sie nicht verändert werden können.
+# Treffer kommen ohne Zugriff auf die Datenbank zurück. Schreibzugriffe über add_metal leeren
+# den Cache, Schreibzugriffe anderer Prozesse (z. B. metall_db_overlay.py) erkennt erst refresh_cache().
+@lru_cache(maxsize=256)
+def _query(db_path, sql, params):
+    cursor = _connect(db_path).execute(sql, params)
+    return tuple(cursor.fetchall())
+
+# Cache leeren, falls seit dem letzten Aufruf eine andere Verbindung in die Datenbank geschrieben hat.
+# Langlebige Aufrufer (z. B. der Batch-Modus von ba_cli) rufen dies einmal pro Befehl auf.
+def refresh_cache(db_path=None):
+    db_path = _resolve_path(db_path)
+    version = _connect(db_path).execute("PRAGMA data_version").fetchone()[0]
+    if _data_versions[db_path] != version:
+        clear_cache()
+    _data_versions[db_path] = version
+
+# Cache leeren, sobald eine Zeile geschrieben wurde
+def clear_cache():
+    _query.cache_clear()
 
 # Funktion zum Hinzufügen von Metallen
-def add_metal(name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie):
+def add_metal(name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie, db_path=None):
+    db_path = _resolve_path(db_path)
+    init_db(db_path)
+
     # Verbindung zur Datenbank herstellen
-    conn = sqlite3.connect("metalle.db")
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # SQL-Befehl, um Daten in die Tabelle 'metalle' einzufügen
-    cursor.execute("INSERT INTO metalle (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie) VALUES (?, ?, ?, ?, ?, ?)", 
+    cursor.execute("INSERT INTO metalle (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie) VALUES (?, ?, ?, ?, ?, ?)",
                    (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie))
 
     # Änderungen speichern und Verbindung schließen
     conn.commit()
     conn.close()
+    clear_cache()
 
-# Funktion zum Abrufen von Daten
-def fetch_data():
-    # Verbindung zur Datenbank herstellen
-    conn = sqlite3.connect("metalle.db")
-    cursor = conn.cursor()
-
-    # SQL-Befehl, um alle Daten aus der Tabelle 'metalle' zu holen
-    cursor.execute("SELECT * FROM metalle")
-    rows = cursor.fetchall()
+# Alle Einträge zu einem Metallnamen
+def get_by_name(name, db_path=None):
+    return _query(_resolve_path(db_path), "SELECT * FROM metalle WHERE name = ? ORDER BY id", (name,))
 
-    # Alle Zeilen durchgehen und ausgeben
-    for row in rows:
-        print(row)
+# Alle Einträge zu einer Ordnungszahl
+def get_by_ordnungszahl(ordnungszahl, db_path=None):
+    return _query(_resolve_path(db_path), "SELECT * FROM metalle WHERE ordnungszahl = ? ORDER BY id", (ordnungszahl,))
 
-    # Verbindung schließen
-    conn.close()
+# Alle Einträge mit gegebener Oxidationsstufe, Koordinationszahl und Geometrie
+def get_by_umgebung(oxidation, koordinationszahl, geometrie, db_path=None):
+    return _query(_resolve_path(db_path), """
+        SELECT * FROM metalle
+        WHERE oxidation = ? AND koordinationszahl = ? AND geometrie = ?
+        ORDER BY id
+    """, (oxidation, koordinationszahl, geometrie))
 
+# Funktion zum Abrufen von Daten
+def fetch_data(db_path=None):
+    # SQL-Befehl, um alle Daten aus der Tabelle 'metalle' zu holen
+    return _query(_resolve_path(db_path), "SELECT * FROM metalle", ())
 
 
-# Daten abrufen und ausgeben
-fetch_data()
+if __name__ == "__main__":
+    # Daten abrufen und ausgeben
+    for row in fetch_data():
+        print(tuple(row))
@@ -0,0 +1,115 @@
+import io
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import ba_cli
+import metalle_db
+import xyz_norm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_ligand_db(path, names):
+    for name in names:
+        xyz_norm.save_to_database(str(path), name, [("O", np.zeros(3)), ("H", np.array([0.0, 0.0, 1.0]))])
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def environment(tmp_path, monkeypatch):
+    # Standardpfade in ein eigenes Verzeichnis legen, damit Zugriffe darauf auffallen
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BA_CONFIG", str(tmp_path / "missing.ini"))
+    for key in ("ligand_db", "metal_db", "input_dir", "output_dir", "arrangements_dir"):
+        monkeypatch.setenv("BA_" + key.upper(), str(tmp_path / "default" / key))
+
+
+def run_batch(monkeypatch, lines, *options):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("".join(line + "\n" for line in lines)))
+    return ba_cli.main([*options, "batch"])
+
+
+@pytest.mark.parametrize("line, expected", [
+    (r"ingest C:\Lig\a.xyz Water 0", ["ingest", r"C:\Lig\a.xyz", "Water", "0"]),
+    (r'export 1 --output_dir "C:\Users\Florian V\out"', ["export", "1", "--output_dir", r"C:\Users\Florian V\out"]),
+    ("list  --atoms   2", ["list", "--atoms", "2"]),
+    ("'a b' c", ["a b", "c"]),
+])
+def test_split_line(line, expected):
+    assert ba_cli.split_line(line) == expected
+
+
+def test_batch_inherits_db_options(tmp_path, monkeypatch, capsys):
+    db_path = make_ligand_db(tmp_path / "other.db", ["Water", "Chloride"])
+    metal_db = str(tmp_path / "metals.db")
+    metalle_db.add_metal("Fe", 26, 6, 2, 6, "Oktaedrisch", metal_db)
+
+    assert run_batch(monkeypatch, ["list", "", '""', "# Kommentar", "metals --name Fe"],
+                     "--db_path", db_path, "--metal_db", metal_db) == 0
+
+    out = capsys.readouterr().out
+    assert "Name: Water" in out and "Name: Chloride" in out
+    assert "'Fe', 26" in out
+    assert not (tmp_path / "default").exists()
+    assert not (tmp_path / "Ligant.db").exists()
+
+
+def test_batch_line_options_win(tmp_path, monkeypatch, capsys):
+    first = make_ligand_db(tmp_path / "first.db", ["Water"])
+    second = make_ligand_db(tmp_path / "second.db", ["Ammonia"])
+
+    assert run_batch(monkeypatch, ["--db_path " + second + " list", "list"], "--db_path", first) == 0
+
+    out = capsys.readouterr().out
+    assert out.index("Name: Ammonia") < out.index("Name: Water")
+
+
+def test_batch_counts_failures(tmp_path, monkeypatch, capsys):
+    db_path = make_ligand_db(tmp_path / "ligands.db", ["Water"])
+
+    lines = ["bogus", "metals --umgebung x 6 Oktaedrisch", "export 7", "batch", "list"]
+    assert run_batch(monkeypatch, lines, "--db_path", db_path) == 1
+
+    captured = capsys.readouterr()
+    assert "Name: Water" in captured.out
+    assert captured.err.count("Fehler:") == 2
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    db_path = make_ligand_db(tmp_path / "ligands.db", ["Water"])
+
+    assert ba_cli.main(["--db_path", db_path, "export", "7"]) == 1
+    assert "Fehler: Kein Molekül mit ID 7" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit) as exc:
+        ba_cli.main(["metals", "--umgebung", "x", "6", "Oktaedrisch"])
+    assert exc.value.code == 2
+
+
+def test_enumerate_checks_central_atom(tmp_path, capsys):
+    db_path = make_ligand_db(tmp_path / "ligands.db", ["Water"])
+    metal_db = str(tmp_path / "metals.db")
+    metalle_db.add_metal("Cu", 29, 9, 2, 4, "Tetraedrisch", metal_db)
+    output_dir = tmp_path / "arrangements"
+    command = ["--db_path", db_path, "--metal_db", metal_db, "enumerate", "Cu", *["Water"] * 6,
+               "--output_dir", str(output_dir)]
+
+    assert ba_cli.main(command) == 1
+    assert "keine Umgebung KZ 6 Oktaedrisch" in capsys.readouterr().err
+    assert not output_dir.exists()
+
+    assert ba_cli.main(command + ["--skip_metal_check"]) == 0
+    assert os.listdir(output_dir) == ["oktaedrischer_komplex_1.xyz"]
+
+
+def test_list_does_not_import_numpy(tmp_path):
+    db_path = make_ligand_db(tmp_path / "ligands.db", ["Water"])
+    env = dict(os.environ, PYTHONPATH=ROOT, BA_LIGAND_DB=db_path)
+    code = "import sys, ba_cli; ba_cli.main(['list']); assert 'numpy' not in sys.modules"
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "Name: Water" in result.stdout
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import metalle_db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metalle.db")
+    metalle_db.add_metal("Fe", 26, 6, 2, 6, "Oktaedrisch", path)
+    metalle_db.add_metal("Fe", 26, 5, 3, 6, "Oktaedrisch", path)
+    metalle_db.add_metal("Cu", 29, 9, 2, 4, "Tetraedrisch", path)
+    return path
+
+
+def names(rows):
+    return [(row["name"], row["oxidation"]) for row in rows]
+
+
+def test_import_creates_no_file(tmp_path):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, "-c", "import metalle_db"], cwd=tmp_path, env=env, check=True)
+    assert os.listdir(tmp_path) == []
+
+
+def test_lookups(db_path):
+    assert names(metalle_db.get_by_name("Fe", db_path)) == [("Fe", 2), ("Fe", 3)]
+    assert names(metalle_db.get_by_ordnungszahl(29, db_path)) == [("Cu", 2)]
+    assert names(metalle_db.get_by_umgebung(2, 6, "Oktaedrisch", db_path)) == [("Fe", 2)]
+    assert metalle_db.get_by_name("Ni", db_path) == ()
+    assert len(metalle_db.fetch_data(db_path)) == 3
+
+
+def test_add_metal_invalidates_cache(db_path):
+    assert len(metalle_db.get_by_umgebung(2, 6, "Oktaedrisch", db_path)) == 1
+    metalle_db.add_metal("Ni", 28, 8, 2, 6, "Oktaedrisch", db_path)
+    assert names(metalle_db.get_by_umgebung(2, 6, "Oktaedrisch", db_path)) == [("Fe", 2), ("Ni", 2)]
+
+
+def test_refresh_cache_detects_external_write(db_path):
+    assert names(metalle_db.get_by_name("Ni", db_path)) == []
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO metalle (name, ordnungszahl, d_elektronen, oxidation, koordinationszahl, geometrie) "
+                 "VALUES ('Ni', 28, 8, 2, 6, 'Oktaedrisch')")
+    conn.commit()
+    conn.close()
+
+    # Ohne refresh_cache bleibt der gecachte Treffer bestehen
+    assert names(metalle_db.get_by_name("Ni", db_path)) == []
+    metalle_db.refresh_cache(db_path)
+    assert names(metalle_db.get_by_name("Ni", db_path)) == [("Ni", 2)]
+
+
+def test_umgebung_lookup_uses_index(db_path):
+    conn = sqlite3.connect(db_path)
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM metalle "
+                        "WHERE oxidation = ? AND koordinationszahl = ? AND geometrie = ?",
+                        (2, 6, "Oktaedrisch")).fetchall()
+    conn.close()
+    assert any("idx_metalle_umgebung" in row[-1] for row in plan)
+
+
+def test_default_path_follows_config(tmp_path, monkeypatch):
+    # Auch metall_db_overlay.py und "python metalle_db.py" verwenden diesen Standardpfad
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BA_METAL_DB", str(tmp_path / "env.db"))
+    metalle_db.add_metal("Co", 27, 7, 2, 6, "Oktaedrisch")
+
+    assert names(metalle_db.get_by_name("Co")) == [("Co", 2)]
+    assert sorted(os.listdir(tmp_path)) == ["env.db"]
@@ -0,0 +1,28 @@
+import pytest
+
+import metalle_db
+import OCKombi
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "metalle.db")
+    metalle_db.add_metal("Fe", 26, 6, 2, 6, "Oktaedrisch", path)
+    metalle_db.add_metal("Cu", 29, 9, 2, 4, "Tetraedrisch", path)
+    return path
+
+
+def test_select_central_atom_geometry(db_path):
+    assert OCKombi.select_central_atom_geometry("Fe", None, db_path) == (6, "Oktaedrisch")
+    assert OCKombi.select_central_atom_geometry("Fe", 2, db_path) == (6, "Oktaedrisch")
+    assert OCKombi.select_central_atom_geometry("Cu", 2, db_path, 4, "Tetraedrisch") == (4, "Tetraedrisch")
+
+
+@pytest.mark.parametrize("central_atom, oxidation, message", [
+    ("Ni", None, "nicht in der Metall-Datenbank"),
+    ("Fe", 3, "keine Oxidationsstufe 3"),
+    ("Cu", 2, "KZ 4 Tetraedrisch"),
+])
+def test_select_central_atom_geometry_errors(db_path, central_atom, oxidation, message):
+    with pytest.raises(ValueError, match=message):
+        OCKombi.select_central_atom_geometry(central_atom, oxidation, db_path)
@@ -0,0 +1,133 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+import xyz_norm
+
+
+def reference_align(coords, central_atom_index):
+    # Frühere Ausrichtung Atom für Atom (Translation, Schwerpunkt ohne zentrales Atom, Rotation)
+    central_atom = coords[central_atom_index]
+    transformed = [coord - central_atom for coord in coords]
+    ligand_coords = np.array([coord for i, coord in enumerate(transformed) if i != central_atom_index])
+    centroid = np.mean(ligand_coords, axis=0)
+
+    z_axis = np.array([0.0, 0.0, 1.0])
+    rotation_axis = np.cross(centroid, z_axis)
+    if np.linalg.norm(rotation_axis) <= 1e-6:
+        return np.array(transformed)
+    rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
+    angle = np.arccos(np.dot(centroid, z_axis) / np.linalg.norm(centroid))
+    ux, uy, uz = rotation_axis
+    c, s = np.cos(angle), np.sin(angle)
+    rotation_matrix = np.array([
+        [c + ux**2 * (1 - c), ux * uy * (1 - c) - uz * s, ux * uz * (1 - c) + uy * s],
+        [uy * ux * (1 - c) + uz * s, c + uy**2 * (1 - c), uy * uz * (1 - c) - ux * s],
+        [uz * ux * (1 - c) - uy * s, uz * uy * (1 - c) + ux * s, c + uz**2 * (1 - c)]
+    ])
+    return np.array([np.dot(rotation_matrix, coord) for coord in transformed])
+
+
+@pytest.fixture
+def ligands():
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(2, 10, size=50)
+    coords = [rng.normal(size=(n, 3)) for n in sizes]
+    anchors = [int(rng.integers(0, n)) for n in sizes]
+    return coords, anchors
+
+
+def test_align_coords_matches_reference(ligands):
+    for coords, anchor in zip(*ligands):
+        aligned = xyz_norm.align_coords(coords, anchor)
+        np.testing.assert_allclose(aligned, reference_align(coords, anchor), atol=1e-12)
+        np.testing.assert_allclose(aligned[anchor], 0.0, atol=1e-12)
+
+
+def test_align_ligand_keeps_atom_labels(ligands):
+    coords, anchor = ligands[0][0], ligands[1][0]
+    atoms = [(f"X{i}", coord) for i, coord in enumerate(coords)]
+    aligned = xyz_norm.align_ligand(atoms, anchor)
+    assert [atom for atom, _ in aligned] == [atom for atom, _ in atoms]
+    np.testing.assert_allclose([coord for _, coord in aligned], reference_align(coords, anchor), atol=1e-12)
+
+
+def test_align_batch_padded_matches_single(ligands):
+    coords, anchors = ligands
+    counts = [len(c) for c in coords]
+    padded = np.zeros((len(coords), max(counts), 3))
+    for i, c in enumerate(coords):
+        padded[i, :len(c)] = c
+
+    aligned = xyz_norm.align_batch(padded, anchors, counts)
+    for i, (c, anchor) in enumerate(zip(coords, anchors)):
+        np.testing.assert_allclose(aligned[i, :len(c)], xyz_norm.align_coords(c, anchor), atol=1e-12)
+
+
+def test_align_ragged_matches_batch(ligands):
+    coords, anchors = ligands
+    counts = [len(c) for c in coords]
+    offsets = np.r_[0, np.cumsum(counts)]
+    padded = np.zeros((len(coords), max(counts), 3))
+    for i, c in enumerate(coords):
+        padded[i, :len(c)] = c
+
+    ragged = xyz_norm.align_ragged(np.vstack(coords), offsets, anchors)
+    batch = xyz_norm.align_batch(padded, anchors, counts)
+    for i, n in enumerate(counts):
+        np.testing.assert_allclose(ragged[offsets[i]:offsets[i + 1]], batch[i, :n], atol=1e-12)
+
+
+@pytest.mark.parametrize("offsets, anchors", [
+    ([0, 2, 4], [0, -1]),
+    ([0, 2, 4], [0, 2]),
+    ([1, 2, 4], [0, 0]),
+    ([0, 2, 3], [0, 0]),
+    ([0, 2, 5], [0, 0]),
+    ([0, 2, 2, 4], [0, 0, 0]),
+])
+def test_align_ragged_rejects_anchor_outside_ligand(offsets, anchors):
+    coords = np.arange(12, dtype=float).reshape(4, 3)
+    with pytest.raises(ValueError):
+        xyz_norm.align_ragged(coords, offsets, anchors)
+
+
+def test_align_batch_rejects_anchor_in_padding():
+    coords = np.ones((2, 4, 3))
+    with pytest.raises(ValueError):
+        xyz_norm.align_batch(coords, [0, 3], [4, 3])
+
+
+def test_renormalize_database(tmp_path):
+    db_path = str(tmp_path / "ligands.db")
+    rng = np.random.default_rng(1)
+
+    stored = [
+        # Bereits ausgerichtet: Donor im Ursprung, Schwerpunkt auf +z
+        xyz_norm.align_coords(rng.normal(size=(5, 3)), 2),
+        # Verschoben und verdreht
+        rng.normal(size=(4, 3)) + [3.0, -2.0, 1.0],
+        rng.normal(size=(6, 3)) * 2.0,
+        # Zwei Atome mit gleichem minimalen Abstand zum Ursprung: das erste gilt als Donor
+        np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.5, 2.0, 3.0], [-1.0, 3.0, 1.0]]),
+    ]
+    for i, coords in enumerate(stored):
+        xyz_norm.save_to_database(db_path, f"ligand_{i}", [("C", coord) for coord in coords])
+
+    assert xyz_norm.renormalize_database(db_path) == len(stored)
+
+    conn = sqlite3.connect(db_path)
+    renormalized = [
+        conn.execute("SELECT x, y, z FROM atoms WHERE molecule_id = ? ORDER BY id", (molecule_id,)).fetchall()
+        for molecule_id in range(1, len(stored) + 1)
+    ]
+    conn.close()
+
+    for coords, rows in zip(stored, renormalized):
+        anchor = int(np.argmin(np.linalg.norm(coords, axis=1)))
+        np.testing.assert_allclose(rows, xyz_norm.align_coords(coords, anchor), atol=1e-9)
+
+    # Bereits ausgerichtete Liganden bleiben unverändert, beim Gleichstand ist Atom 0 der Donor
+    np.testing.assert_allclose(renormalized[0], stored[0], atol=1e-9)
+    np.testing.assert_allclose(renormalized[3][0], 0.0, atol=1e-12)
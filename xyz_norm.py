@@ -65,56 +65,161 @@ def save_to_database(db_path, molecule_name, atoms):
     print(f"Molekül '{molecule_name}' wurde in der Datenbank gespeichert.")
 
 def align_ligand(atoms, central_atom_index):
-    central_atom = atoms[central_atom_index][1]
-    transformed_atoms = []
+    coords = np.array([coord for atom, coord in atoms], dtype=float)
+    aligned = align_coords(coords, central_atom_index)
+    return [(atom, coord) for (atom, _), coord in zip(atoms, aligned)]
+
+def align_coords(coords, central_atom_index):
+    # Einzelner Ligand als (N, 3)-Array -> Batch der Größe 1
+    coords = np.asarray(coords, dtype=float)
+    return align_batch(coords[np.newaxis], [central_atom_index])[0]
+
+def align_batch(coords, central_atom_indices, counts=None):
+    # Ausrichtung eines Blocks von Liganden: coords (B, N, 3), aufgefüllt bis N Atome.
+    # counts gibt die Anzahl der gültigen Atome je Ligand an (Standard: alle N).
+    coords = np.asarray(coords, dtype=float)
+    batch, n_atoms, _ = coords.shape
+    anchors = np.asarray(central_atom_indices, dtype=int)
+    counts = np.full(batch, n_atoms) if counts is None else np.asarray(counts, dtype=int)
+    if np.any(counts > n_atoms):
+        raise ValueError("Die Anzahl der Atome eines Liganden übersteigt die Blockgröße.")
+    _check_anchors(anchors, counts)
+    rows = np.arange(batch)
+
+    # Translation: Verschiebe das zentrale Atom jedes Liganden zum Ursprung
+    transformed = coords - coords[rows, anchors][:, np.newaxis, :]
+
+    # Schwerpunkt ohne das zentrale Atom (über den Index, nicht über Koordinatenvergleich)
+    mask = np.arange(n_atoms)[np.newaxis, :] < counts[:, np.newaxis]
+    mask[rows, anchors] = False
+    centroids = np.einsum('bn,bni->bi', mask, transformed) / np.maximum(counts - 1, 1)[:, np.newaxis]
+
+    # Rotation auf alle Atome anwenden (aufgefüllte Zeilen werden mitgedreht und bleiben ungenutzt)
+    rotation_matrices = _rotation_matrices_to_z(centroids)
+    return np.einsum('bij,bnj->bni', rotation_matrices, transformed)
+
+def align_ragged(coords, offsets, central_atom_indices):
+    # Ausrichtung von Liganden unterschiedlicher Länge, die hintereinander in coords (M, 3) liegen.
+    # offsets (B + 1) enthält die Startindizes der Liganden und am Ende M,
+    # central_atom_indices die Indizes der zentralen Atome relativ zum Ligandenanfang.
+    coords = np.asarray(coords, dtype=float)
+    offsets = np.asarray(offsets, dtype=int)
+    if offsets.ndim != 1 or len(offsets) < 2 or offsets[0] != 0 or offsets[-1] != len(coords):
+        raise ValueError(f"offsets muss bei 0 beginnen und bei der Anzahl der Atome ({len(coords)}) enden.")
+    counts = np.diff(offsets)
+    if np.any(counts < 1):
+        raise ValueError("Jeder Ligand muss mindestens ein Atom enthalten.")
+    local_anchors = np.asarray(central_atom_indices, dtype=int)
+    _check_anchors(local_anchors, counts)
+    segment = np.repeat(np.arange(len(counts)), counts)
+    anchors = offsets[:-1] + local_anchors
+
+    # Translation: Verschiebe das zentrale Atom jedes Liganden zum Ursprung
+    transformed = coords - coords[anchors][segment]
+
+    # Das zentrale Atom liegt jetzt im Ursprung und trägt zur Summe nichts bei
+    centroids = np.add.reduceat(transformed, offsets[:-1], axis=0) / np.maximum(counts - 1, 1)[:, np.newaxis]
+
+    rotation_matrices = _rotation_matrices_to_z(centroids)
+    return np.einsum('mij,mj->mi', rotation_matrices[segment], transformed)
+
+def _check_anchors(anchors, counts):
+    # Das zentrale Atom muss innerhalb des eigenen Liganden liegen (kein Nachbar, keine Auffüllung)
+    if anchors.shape != counts.shape:
+        raise ValueError("Für jeden Liganden muss genau ein zentrales Atom angegeben werden.")
+    invalid = np.flatnonzero((anchors < 0) | (anchors >= counts))
+    if invalid.size:
+        i = invalid[0]
+        raise ValueError(f"Index des zentralen Atoms {anchors[i]} liegt außerhalb von Ligand {i} ({counts[i]} Atome).")
+
+def _rotation_matrices_to_z(centroids):
+    # Ziel: Zentriere jeden Liganden entlang der z-Achse (Rodrigues-Formel für alle Schwerpunkte)
+    z_axis = np.array([0.0, 0.0, 1.0])
+    rotation_axes = np.cross(centroids, z_axis)
+    axis_norms = np.linalg.norm(rotation_axes, axis=1)
+    centroid_norms = np.linalg.norm(centroids, axis=1)
+
+    # Ohne ausreichend lange Rotationsachse bleibt der Ligand unverändert
+    rotate = axis_norms > 1e-6
+    rotation_matrices = np.broadcast_to(np.eye(3), (len(centroids), 3, 3)).copy()
+    if not np.any(rotate):
+        return rotation_matrices
+
+    axes = rotation_axes[rotate] / axis_norms[rotate][:, np.newaxis]
+    cos_theta = np.clip(centroids[rotate, 2] / centroid_norms[rotate], -1.0, 1.0)
+    sin_theta = np.sqrt(1.0 - cos_theta**2)
+    ux, uy, uz = axes.T
+    zero = np.zeros_like(ux)
+    cross_matrices = np.stack([
+        np.stack([zero, -uz, uy], axis=-1),
+        np.stack([uz, zero, -ux], axis=-1),
+        np.stack([-uy, ux, zero], axis=-1)
+    ], axis=1)
+    rotation_matrices[rotate] = (
+        cos_theta[:, np.newaxis, np.newaxis] * np.eye(3)
+        + sin_theta[:, np.newaxis, np.newaxis] * cross_matrices
+        + (1 - cos_theta)[:, np.newaxis, np.newaxis] * np.einsum('bi,bj->bij', axes, axes)
+    )
+    return rotation_matrices
+
+def renormalize_database(db_path):
+    # Richtet alle gespeicherten Moleküle in einem Durchgang neu aus und überschreibt die Koordinaten.
+    # Als zentrales Atom gilt je Molekül das Atom, das dem Ursprung am nächsten liegt.
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
 
-    # Translation: Verschiebe das zentrale Atom zum Ursprung
-    for atom, coord in atoms:
-        transformed_coord = coord - central_atom
-        transformed_atoms.append((atom, transformed_coord))
-
-    # Berechne den Schwerpunkt des Liganden (ohne das zentrale Atom)
-    ligand_coords = np.array([coord for atom, coord in transformed_atoms if not np.all(coord == [0, 0, 0])])
-    centroid = np.mean(ligand_coords, axis=0)
-
-    # Ziel: Zentriere den Liganden entlang der z-Achse
-    z_axis = np.array([0, 0, 1])
-    rotation_axis = np.cross(centroid, z_axis)
-    rotation_angle = np.arccos(np.dot(centroid, z_axis) / (np.linalg.norm(centroid) * np.linalg.norm(z_axis)))
-
-    # Normiere die Rotationsachse
-    if np.linalg.norm(rotation_axis) > 1e-6:
-        rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
-        rotation_matrix = rotation_matrix_from_axis_angle(rotation_axis, rotation_angle)
-
-        # Wende die Rotation auf alle Atome an
-        for i, (atom, coord) in enumerate(transformed_atoms):
-            transformed_atoms[i] = (atom, np.dot(rotation_matrix, coord))
-
-    return transformed_atoms
-
-def rotation_matrix_from_axis_angle(axis, angle):
-    cos_theta = np.cos(angle)
-    sin_theta = np.sin(angle)
-    ux, uy, uz = axis
-    return np.array([
-        [cos_theta + ux**2 * (1 - cos_theta), ux * uy * (1 - cos_theta) - uz * sin_theta, ux * uz * (1 - cos_theta) + uy * sin_theta],
-        [uy * ux * (1 - cos_theta) + uz * sin_theta, cos_theta + uy**2 * (1 - cos_theta), uy * uz * (1 - cos_theta) - ux * sin_theta],
-        [uz * ux * (1 - cos_theta) - uy * sin_theta, uz * uy * (1 - cos_theta) + ux * sin_theta, cos_theta + uz**2 * (1 - cos_theta)]
-    ])
+    cursor.execute('SELECT id, molecule_id, x, y, z FROM atoms ORDER BY molecule_id, id')
+    rows = cursor.fetchall()
+    if not rows:
+        conn.close()
+        print("Keine Atome in der Datenbank gefunden.")
+        return 0
+
+    data = np.array(rows, dtype=float)
+    atom_ids = data[:, 0].astype(int)
+    molecule_ids = data[:, 1].astype(int)
+    coords = data[:, 2:]
+
+    # Startindizes der Moleküle in der sortierten Atomliste
+    starts = np.flatnonzero(np.r_[True, molecule_ids[1:] != molecule_ids[:-1]])
+    offsets = np.r_[starts, len(rows)]
+
+    # Index des Atoms mit minimalem Abstand zum Ursprung je Molekül; bei gleichem Abstand das erste Atom
+    squared_norms = np.einsum('mi,mi->m', coords, coords)
+    segment = np.repeat(np.arange(len(starts)), np.diff(offsets))
+    order = np.lexsort((squared_norms, segment))
+    central_atom_indices = order[starts] - starts
+
+    aligned = align_ragged(coords, offsets, central_atom_indices)
+
+    cursor.executemany('UPDATE atoms SET x = ?, y = ?, z = ? WHERE id = ?',
+                       zip(aligned[:, 0].tolist(), aligned[:, 1].tolist(), aligned[:, 2].tolist(), atom_ids.tolist()))
+    conn.commit()
+    conn.close()
+    print(f"{len(starts)} Moleküle in der Datenbank '{db_path}' wurden neu ausgerichtet.")
+    return len(starts)
 
 if __name__ == "__main__":
+    from ba_config import get_path
 
     parser = argparse.ArgumentParser(description="Align ligand in an XYZ file along the z-axis and save to a database.")
-    parser.add_argument("input_file", help="Name of the input XYZ file (located in Lig_Alt directory).")
-    parser.add_argument("molecule_name", help="Name of the molecule to store in the database.")
-    parser.add_argument("central_atom_index", type=int, help="Index of the central atom (0-based, after Cu is removed).")
-    parser.add_argument("--db_path", default="c:/Users/Florian V/Documents/Komplexe/DB/Ligant.db", help="Path to the SQLite database file.")
+    parser.add_argument("input_file", nargs="?", help="Name of the input XYZ file (located in Lig_Alt directory).")
+    parser.add_argument("molecule_name", nargs="?", help="Name of the molecule to store in the database.")
+    parser.add_argument("central_atom_index", nargs="?", type=int, help="Index of the central atom (0-based, after Cu is removed).")
+    parser.add_argument("--db_path", default=get_path("ligand_db"), help="Path to the SQLite database file.")
+    parser.add_argument("--renormalize", action="store_true", help="Re-align all molecules already stored in the database in place.")
 
     args = parser.parse_args()
 
+    if args.renormalize:
+        renormalize_database(args.db_path)
+        raise SystemExit(0)
+
+    if args.input_file is None or args.molecule_name is None or args.central_atom_index is None:
+        parser.error("input_file, molecule_name and central_atom_index are required unless --renormalize is given.")
+
     # Verzeichnis für Eingabedateien
-    input_dir = "c:/Users/Florian V/Documents/Komplexe/DB/Lig_Alt"
+    input_dir = get_path("input_dir")
     input_file_path = os.path.join(input_dir, args.input_file)
 
     # Überprüfen, ob die Eingabedatei existiert
@@ -126,4 +231,4 @@ if __name__ == "__main__":
     transformed_atoms = align_ligand(atoms, args.central_atom_index)
     save_to_database(args.db_path, args.molecule_name, transformed_atoms)
 
-    print(f"Transformierte Daten wurden in der Datenbank '{args.db_path}' gespeichert.")
\ No newline at end of file
+    print(f"Transformierte Daten wurden in der Datenbank '{args.db_path}' gespeichert.")
\ No newline at end of file